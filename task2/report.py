@@ -1,12 +1,24 @@
 from sys import argv  # to check arguments of script
+import os  # to get modification time and size of the input file and to advise the OS that it is read sequentially
 from os.path import exists  # to check whether the input file exists
-import filecmp  # to check whether an input and output file are the same
+from os.path import samefile  # to check whether an input and output file are the same
+from os.path import splitext  # to check the extension of the input file
 from typing import TextIO, Dict, Set, List
 from collections import defaultdict
+from functools import lru_cache  # to avoid validating the same unchanged input file again
 
 INPUT_FILE = 'test.csv'
 SEPARATOR = ';'
 OUTPUT_FILE = 'result.csv'
+PARAMETERS_KEYS = {
+    '-if': 'input_filename',
+    '--input-file': 'input_filename',
+    '-of': 'output_filename',
+    '--output-file': 'output_filename',
+    '-s': 'separator',
+    '--separator': 'separator'
+}
+READ_BUFFER_SIZE = 1 << 20  # 1 MiB, to read large input files with fewer syscalls
 
 
 def validate_files(input_filename: str, output_filename: str, separator: str) -> None:
@@ -23,19 +35,40 @@ def validate_files(input_filename: str, output_filename: str, separator: str) ->
     :raises ValueError: when input file has wrong format: not 6 columns or 6th column is not a number; or when input
         and output files are same
     """
-    if exists(output_filename) and filecmp.cmp(input_filename, output_filename):
-        raise ValueError('Input and output files are the same')
-
     if exists(input_filename):
-        extension = input_filename.split('.')[-1]
-        if extension != 'csv':
+        extension = splitext(input_filename)[1].lower()
+        if extension != '.csv':
             raise ValueError('Your input file is not .csv file')
     else:
         raise ValueError('Your input file doesn\'t exist')
-    with open(input_filename, "r", encoding="utf8") as file:
-        line = file.readline()
+
+    if exists(output_filename) and samefile(input_filename, output_filename):
+        raise ValueError('Input and output files are the same')
+    input_stat = os.stat(input_filename)
+    validate_file_format(input_filename, input_stat.st_mtime_ns, input_stat.st_size, separator)
+
+
+@lru_cache(maxsize=32)
+def validate_file_format(input_filename: str, modification_time: int, size: int, separator: str) -> None:
+    """
+    Checks that the first row of input file has correct amount and type of fields. The result is cached, so the file
+    is read again only when its modification time or size changes.
+
+    :param input_filename: name of input file of a report
+    :type input_filename: str
+    :param modification_time: modification time of input file in nanoseconds, used only as a part of cache key
+    :type modification_time: int
+    :param size: size of input file in bytes, used only as a part of cache key
+    :type size: int
+    :param separator:  symbol of separator in csv-file
+    :type separator: str
+    :return: None
+    :raises ValueError: when input file has wrong format: not 6 columns or 6th column is not a number
+    """
+    with open(input_filename, 'rb') as file:  # only the first data line is checked, so there is no need to decode
+        file.readline()
         line = file.readline()
-        splitted_line = line.split(separator)
+        splitted_line = line.split(separator.encode('utf8'))
         try:
             int(splitted_line[5])
             if len(splitted_line) != 6:
@@ -57,43 +90,28 @@ def parse_parameters() -> tuple[str, str, str]:
     :raises AttributeError: when there are errors in list of parameters
     :raises ValueError: when input or output file are not correct
     """
-    if len(argv) == 1:
-        validate_files(INPUT_FILE, OUTPUT_FILE, SEPARATOR)
-        return INPUT_FILE, OUTPUT_FILE, SEPARATOR
-    parameters_options = {
-        'input_filename': {
-            'keys': ['-if', '--input-file'],
-            'index': 0,
-            'value': INPUT_FILE
-        },
-        'output_filename': {
-            'keys': ['-of', '--output-file'],
-            'index': 0,
-            'value': OUTPUT_FILE
-        },
-        'separator': {
-            'keys': ['-s', '--separator'],
-            'index': 0,
-            'value': SEPARATOR
-        }
+    parameters_values = {
+        'input_filename': INPUT_FILE,
+        'output_filename': OUTPUT_FILE,
+        'separator': SEPARATOR
     }
-    for fact_parameter_index, fact_parameter_value in enumerate(argv):
-        for param_name, param_options in parameters_options.items():
-            if fact_parameter_value in param_options['keys']:
-                if parameters_options[param_name]['index'] != 0:
-                    raise AttributeError(f'Your script has more than one {param_name}')
-                parameters_options[param_name]['index'] = fact_parameter_index
-
-    for param_name, param_options in parameters_options.items():
-        param_index = parameters_options[param_name]['index']
-        if param_index + 1 == len(argv):
+    given_parameters = set()
+    parameters_iterator = iter(argv[1:])
+    for fact_parameter_value in parameters_iterator:
+        param_name = PARAMETERS_KEYS.get(fact_parameter_value)
+        if param_name is None:
+            continue
+        if param_name in given_parameters:
+            raise AttributeError(f'Your script has more than one {param_name}')
+        given_parameters.add(param_name)
+        param_value = next(parameters_iterator, None)
+        if param_value is None or param_value in PARAMETERS_KEYS:
             raise AttributeError(f'Your script parameters have no {param_name}')
-        if param_index != 0:
-            parameters_options[param_name]['value'] = argv[param_index + 1]
+        parameters_values[param_name] = param_value
 
-    input_filename = parameters_options['input_filename']['value']
-    output_filename = parameters_options['output_filename']['value']
-    separator = parameters_options['separator']['value']
+    input_filename = parameters_values['input_filename']
+    output_filename = parameters_values['output_filename']
+    separator = parameters_values['separator']
 
     validate_files(input_filename, output_filename, separator)
 
@@ -134,10 +152,9 @@ def generate_hierarchy(file: TextIO, separator: str) -> Dict[str, Set[str]]:
     :rtype: Dict[str, Set[str]]
     """
     departments_list = defaultdict(set)
-    for line_number, line in enumerate(file):
-        if line_number == 0:
-            continue
-        _, department, team, *_ = line.split(separator)
+    next(file, None)  # skip the header
+    for line in file:
+        _, department, team, _ = line.split(separator, 3)  # the rest of the columns is not needed
         departments_list[department].add(team)
     return departments_list
 
@@ -159,6 +176,7 @@ def generate_report_by_department(file: TextIO, separator: str) -> List[Dict[str
     """
     Generate report about each department: amount of people in it, difference between min and max salary and average
     salary of employees.
+    The file is read line by line, only running totals per department are kept in memory.
     :param file: input csv file
     :type file: TextIO
     :param separator: symbol of separator in csv file
@@ -170,19 +188,42 @@ def generate_report_by_department(file: TextIO, separator: str) -> List[Dict[str
         Средняя зарплата: average salary of employees
     :rtype: List[Dict[str, str | int | float]]
     """
-    departments_dict = defaultdict(list)
-    for line_number, line in enumerate(file):
-        if line_number == 0:
-            continue
-        _, department, *_, salary = line.split(separator)
-        departments_dict[department].append(int(salary))
+    departments_stats = {}  # department -> [amount, min salary, max salary, sum of salaries]
+    get_department_stats = departments_stats.get  # avoid attribute lookup on every line
+    next(file, None)  # skip the header
+    for line in file:
+        head, salary = line.rsplit(separator, 1)  # only salary and department are needed
+        department = head.split(separator, 2)[1]
+        salary = int(salary)
+        stats = get_department_stats(department)
+        if stats is None:
+            departments_stats[department] = [1, salary, salary, salary]
+        else:
+            stats[0] += 1
+            if salary < stats[1]:
+                stats[1] = salary
+            elif salary > stats[2]:
+                stats[2] = salary
+            stats[3] += salary
+    return build_department_report(departments_stats)
+
+
+def build_department_report(departments_stats: Dict[str, List[int]]) -> List[Dict[str, str | int] | float]:
+    """
+    Converts running totals of each department into a report, which is returned by generate_report_by_department().
+    :param departments_stats: dict with keys as department name and value as list of amount of people, min salary,
+        max salary and sum of salaries in that department
+    :type departments_stats: Dict[str, List[int]]
+    :return: list of dicts, where each item describes each department
+    :rtype: List[Dict[str, str | int | float]]
+    """
     departments_list = []
-    for department, salaries in departments_dict.items():
+    for department, (amount, min_salary, max_salary, salaries_sum) in departments_stats.items():
         departments_list.append({
             'Название': department,
-            'Численность': len(salaries),
-            'Вилка зарплат': f'{min(salaries)} - {max(salaries)}',
-            'Средняя зарплата': sum(salaries) / len(salaries)
+            'Численность': amount,
+            'Вилка зарплат': f'{min_salary} - {max_salary}',
+            'Средняя зарплата': salaries_sum / amount
         })
     return departments_list
 
@@ -213,18 +254,9 @@ def save_department_report(departments_list: [dict], output_filename: str, separ
     :type separator: str
     :return: None
     """
-    with open(output_filename, 'w+', encoding='utf8') as new_file:
-        line = ''
-        for property_name in departments_list[0]:
-            line += f'{property_name}{separator}'
-        line = line[:-1]
-        new_file.write(f'{line}\n')
-        for department in departments_list:
-            line = ''
-            for property_value in department.values():
-                line += f'{property_value}{separator}'
-            line = line[:-1]
-            new_file.write(f'{line}\n')
+    with open(output_filename, 'w', encoding='utf8') as new_file:
+        new_file.write(separator.join(departments_list[0].keys()) + '\n')
+        new_file.writelines(separator.join(map(str, department.values())) + '\n' for department in departments_list)
 
 
 def generate_report(input_filename: str, output_filename: str, separator: str, option: str) -> None:
@@ -242,7 +274,9 @@ def generate_report(input_filename: str, output_filename: str, separator: str, o
     :type option: str
     :return: None
     """
-    with open(input_filename, "r", encoding="utf8") as file:
+    with open(input_filename, "r", encoding="utf8", buffering=READ_BUFFER_SIZE, newline='') as file:
+        if hasattr(os, 'posix_fadvise'):  # not available on Windows and macOS
+            os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
         if option == '1':
             departments_hierarchy = generate_hierarchy(file, separator)
             print_department_hierarchy(departments_hierarchy)